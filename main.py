@@ -1,17 +1,25 @@
+from __future__ import annotations
+
 import os
 import sys
 import ctypes
+import gc
+import math
 import random
 import time
+from bisect import bisect_right
+from functools import partial
 from typing import Optional, Dict, Tuple, List
 
 from PySide6.QtCore import (
-    Qt, QTimer, QPoint, QSettings, QRect,
-    QPropertyAnimation, QEasingCurve, QParallelAnimationGroup
+    Qt, QTimer, QPoint, QSettings, QRect, QRectF, QSize, QEvent,
+    QVariantAnimation, QEasingCurve,
+    QObject, QThread, Signal, Slot
 )
 from PySide6.QtGui import (
     QFont, QIcon, QAction, QActionGroup, QKeySequence, QShortcut,
-    QColor, QCursor, QFontMetrics
+    QColor, QCursor, QFontMetrics, QImage, QPainter, QPainterPath, QPixmap,
+    QPalette, QStaticText
 )
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QFrame,
@@ -21,7 +29,7 @@ from PySide6.QtWidgets import (
 
 import psutil
 
-from sensors_lhm import LhmReader
+from sensors_lhm import NEED_GPU, Idx, LhmReader
 from sensors_psutil import PsutilReader
 
 
@@ -30,6 +38,21 @@ from sensors_psutil import PsutilReader
 # -------------------------
 user32 = ctypes.WinDLL("user32", use_last_error=True)
 
+# 显式声明签名：HWND / LONG_PTR 在 x64 上是 64 位，默认的 c_int 会截断
+# 32 位 user32 没有 *LongPtr* 导出（只是宏），退回到 *LongW*
+_GetWindowLongPtr = getattr(user32, "GetWindowLongPtrW", user32.GetWindowLongW)
+_SetWindowLongPtr = getattr(user32, "SetWindowLongPtrW", user32.SetWindowLongW)
+_GetWindowLongPtr.argtypes = [ctypes.c_void_p, ctypes.c_int]
+_GetWindowLongPtr.restype = ctypes.c_ssize_t
+_SetWindowLongPtr.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_ssize_t]
+_SetWindowLongPtr.restype = ctypes.c_ssize_t
+user32.SetWindowPos.argtypes = [
+    ctypes.c_void_p, ctypes.c_void_p,
+    ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+    ctypes.c_uint,
+]
+user32.SetWindowPos.restype = ctypes.c_int
+
 GWL_EXSTYLE = -20
 WS_EX_LAYERED = 0x00080000
 WS_EX_TRANSPARENT = 0x00000020
@@ -50,14 +73,14 @@ def _get_hwnd(widget: QWidget) -> int:
 
 def set_click_through(widget: QWidget, enabled: bool):
     hwnd = _get_hwnd(widget)
-    ex_style = user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
+    ex_style = _GetWindowLongPtr(hwnd, GWL_EXSTYLE)
     ex_style |= WS_EX_LAYERED | WS_EX_TOOLWINDOW
     if enabled:
         ex_style |= WS_EX_TRANSPARENT
     else:
         ex_style &= ~WS_EX_TRANSPARENT
-    user32.SetWindowLongW(hwnd, GWL_EXSTYLE, ex_style)
-    user32.SetWindowPos(hwnd, 0, 0, 0, 0, 0,
+    _SetWindowLongPtr(hwnd, GWL_EXSTYLE, ex_style)
+    user32.SetWindowPos(hwnd, None, 0, 0, 0, 0,
                         0x0001 | 0x0002 | 0x0020)  # NOMOVE|NOSIZE|FRAMECHANGED
 
 
@@ -69,7 +92,11 @@ def _exe_path_for_startup() -> str:
     return f"\"{py}\" \"{script}\""
 
 
-def is_startup_enabled() -> bool:
+# 托盘菜单每次同步勾选状态都会问一次，注册表只在首次/修改后读取
+_STARTUP_CACHE: Optional[bool] = None
+
+
+def _query_startup_enabled() -> bool:
     if winreg is None:
         return False
     try:
@@ -80,7 +107,15 @@ def is_startup_enabled() -> bool:
         return False
 
 
+def is_startup_enabled() -> bool:
+    global _STARTUP_CACHE
+    if _STARTUP_CACHE is None:
+        _STARTUP_CACHE = _query_startup_enabled()
+    return _STARTUP_CACHE
+
+
 def set_startup_enabled(enabled: bool):
+    global _STARTUP_CACHE
     if winreg is None:
         return
     try:
@@ -92,8 +127,10 @@ def set_startup_enabled(enabled: bool):
                     winreg.DeleteValue(k, RUN_VALUE_NAME)
                 except FileNotFoundError:
                     pass
+        _STARTUP_CACHE = bool(enabled)
     except Exception:
-        pass
+        # 写失败时状态未知，下次重新读注册表
+        _STARTUP_CACHE = None
 
 
 # -------------------------
@@ -103,122 +140,211 @@ def clamp(n: int, a: int, b: int) -> int:
     return max(a, min(b, n))
 
 
-def fmt_pct(v: Optional[float]) -> str:
-    if v is None:
-        return "--"
-    return f"{v:.0f}%"
+# 预先绑定好的格式化方法；fmt_rate_short 用 (v >= 10) 直接索引，不走 if/elif 链
+_PCT_FMT = "{:.0f}%".format
+_RATE_MB_S_FMT = "{:.2f}MB/s".format
+_RATE_SHORT_FMT = ("{:.1f}".format, "{:.0f}".format)
+
 
+# 读数一律是 float，读不到的为 nan；v != v 即 nan 判断，比 math.isnan 少一次函数调用
+def fmt_pct(v: float) -> str:
+    return "--" if v != v else _PCT_FMT(v)
 
-def fmt_rate_mb_s(v: Optional[float]) -> str:
-    if v is None:
-        return "--MB/s"
-    return f"{v:.2f}MB/s"
 
+def fmt_rate_mb_s(v: float) -> str:
+    return "--MB/s" if v != v else _RATE_MB_S_FMT(v)
 
-def fmt_rate_short(v: Optional[float]) -> str:
+
+def fmt_rate_short(v: float) -> str:
     """
     简写速度（用于 DISK 超短显示）：
       <10 => 1位小数
       >=10 => 0位
     """
-    if v is None:
-        return "--"
-    if v < 10:
-        return f"{v:.1f}"
-    return f"{v:.0f}"
+    return "--" if v != v else _RATE_SHORT_FMT[v >= 10](v)
+
+
+# 面板五行的模板，绑定好的 str.format，刷新时直接调用
+_LINE1 = "CPU   {}  {}".format
+_LINE2 = "GPU   {}  {}".format
+_LINE3 = "RAM   {}  {}".format
+_LINE4 = "DISK  {}/{}  {}".format
+_LINE5 = "网络  ↑{}  ↓{}".format
 
 
 # -------------------------
 # Disk rate reader (R/W MB/s)
 # -------------------------
+def _compute_rates(prev_r: int, prev_w: int, cur_r: int, cur_w: int, dt: float) -> Tuple[float, float]:
+    """字节计数差 -> (读, 写) MB/s，负值（计数器回绕/重置）归零"""
+    scale = 1.0 / (max(1e-3, dt) * 1024 * 1024)
+    return max(0.0, (cur_r - prev_r) * scale), max(0.0, (cur_w - prev_w) * scale)
+
+
 class DiskRateReader:
     """
     使用 psutil.disk_io_counters() 计算全盘总读/写 MB/s
     """
     def __init__(self):
-        self._last = None
-        self._last_t = None
+        self._last_r: Optional[int] = None
+        self._last_w = 0
+        self._last_t = 0.0
 
-    def read(self) -> Tuple[Optional[float], Optional[float]]:
+    def read(self) -> Tuple[float, float]:
+        """(读, 写) MB/s，读不到为 nan"""
         try:
-            io = psutil.disk_io_counters()
+            io = psutil.disk_io_counters(perdisk=False, nowrap=False)
             if io is None:
-                return None, None
+                return math.nan, math.nan
 
-            now = time.time()
-            if self._last is None or self._last_t is None:
-                self._last = io
-                self._last_t = now
+            now = time.perf_counter()
+            cur_r = io.read_bytes
+            cur_w = io.write_bytes
+            if self._last_r is None:
+                self._last_r, self._last_w, self._last_t = cur_r, cur_w, now
                 return 0.0, 0.0
 
-            dt = max(1e-3, now - self._last_t)
-            read_bps = (io.read_bytes - self._last.read_bytes) / dt
-            write_bps = (io.write_bytes - self._last.write_bytes) / dt
-
-            self._last = io
-            self._last_t = now
-
-            r = read_bps / (1024 * 1024)
-            w = write_bps / (1024 * 1024)
-            if r < 0:
-                r = 0.0
-            if w < 0:
-                w = 0.0
+            r, w = _compute_rates(self._last_r, self._last_w, cur_r, cur_w, now - self._last_t)
+            self._last_r, self._last_w, self._last_t = cur_r, cur_w, now
             return r, w
         except Exception:
-            return None, None
+            return math.nan, math.nan
+
+
+# -------------------------
+# Sensor worker (off the UI thread)
+# -------------------------
+class SensorWorker(QObject):
+    """
+    在后台线程里周期性读取全部传感器，合并成一个 dict 通过信号发回 UI 线程；
+    LHM 走 pythonnet，个别机器上一次读取能阻塞几十毫秒，不能放在 UI 线程。
+    每次读完才重新计时（读 -> 等 interval -> 读），读得慢时不会堆积待处理的 timeout
+    """
+    readings = Signal(dict)
+
+    # 面板（展开或收起）只用到 LHM 的 GPU 使用率，其它数据来自 psutil
+    LHM_NEED = NEED_GPU
+
+    def __init__(self, lhm: LhmReader, psr: PsutilReader, disk_rate: DiskRateReader, interval_ms: int = 1000):
+        super().__init__()
+        self.lhm = lhm
+        self.psr = psr
+        self.disk_rate = disk_rate
+        self.interval_ms = interval_ms
+        self._timer: Optional[QTimer] = None
+
+    @Slot()
+    def start(self):
+        # 定时器要在工作线程里创建，timeout 才会在该线程触发
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.interval_ms)
+        self._timer.timeout.connect(self.poll)
+        self.poll()
+
+    @Slot()
+    def poll(self):
+        try:
+            self._read_and_emit()
+        finally:
+            self._timer.start()
+
+    def _read_and_emit(self):
+        lhm = self.lhm.read(self.LHM_NEED)
+        psu = self.psr.read()
+        disk_r, disk_w = self.disk_rate.read()
+
+        data = dict(psu)
+        data["gpu_load"] = lhm[Idx.GPU_LOAD]
+        data["disk_r"] = disk_r
+        data["disk_w"] = disk_w
+        self.readings.emit(data)
 
 
 # -------------------------
 # Phrase buckets (stable by range)
 # -------------------------
-Buckets = List[Tuple[float, float, List[str]]]
-
-CPU_BUCKETS: Buckets = [
-    (0, 10, ["摸鱼模式 😴", "待机冥想 🧘", "风扇在休假 🌿"]),
-    (10, 30, ["轻松写写 ✍️", "低功耗巡航 🛫", "小跑一下 🏃"]),
-    (30, 60, ["认真干活中 🛠️", "多线程开工 🧵", "正在加班 ☕"]),
-    (60, 85, ["火力全开 💪", "CPU 在狂奔 🏎️", "性能模式 ON ⚡"]),
-    (85, 101, ["快冒烟了 🔥", "别再加任务了 😵", "风扇起飞 ✈️"]),
-]
-GPU_BUCKETS: Buckets = [
-    (0, 10, ["显卡在睡觉 💤", "桌面模式 🖥️", "低频养生 🌙"]),
-    (10, 35, ["轻量渲染 🎨", "小试牛刀 🐮", "打个小怪 👾"]),
-    (35, 65, ["稳稳输出 🎯", "正在加速 🚀", "甜品负载 🍰"]),
-    (65, 90, ["光追开到爽 ✨", "显卡在燃烧 🔥", "帧数冲刺 🏁"]),
-    (90, 101, ["核弹渲染 ☢️", "GPU：我尽力了 😭", "要爆了 📢"]),
-]
-RAM_BUCKETS: Buckets = [
-    (0, 25, ["内存很松 🫧", "还很空 😌", "随便开都行 🧃"]),
-    (25, 55, ["占用正常 ✅", "稳稳的 🧘", "够用就好 🙂"]),
-    (55, 75, ["开始拥挤了 🚶", "有点挤 😅", "注意后台 👀"]),
-    (75, 90, ["内存吃紧 🧨", "要清理了 🧹", "后台太多了 😵"]),
-    (90, 101, ["内存告急 🚨", "快溢出了 🫠", "请关闭点东西 😭"]),
-]
+Buckets = Tuple[Tuple[float, float, Tuple[str, ...]], ...]
+
+CPU_BUCKETS: Buckets = (
+    (0, 10, ("摸鱼模式 😴", "待机冥想 🧘", "风扇在休假 🌿")),
+    (10, 30, ("轻松写写 ✍️", "低功耗巡航 🛫", "小跑一下 🏃")),
+    (30, 60, ("认真干活中 🛠️", "多线程开工 🧵", "正在加班 ☕")),
+    (60, 85, ("火力全开 💪", "CPU 在狂奔 🏎️", "性能模式 ON ⚡")),
+    (85, 101, ("快冒烟了 🔥", "别再加任务了 😵", "风扇起飞 ✈️")),
+)
+GPU_BUCKETS: Buckets = (
+    (0, 10, ("显卡在睡觉 💤", "桌面模式 🖥️", "低频养生 🌙")),
+    (10, 35, ("轻量渲染 🎨", "小试牛刀 🐮", "打个小怪 👾")),
+    (35, 65, ("稳稳输出 🎯", "正在加速 🚀", "甜品负载 🍰")),
+    (65, 90, ("光追开到爽 ✨", "显卡在燃烧 🔥", "帧数冲刺 🏁")),
+    (90, 101, ("核弹渲染 ☢️", "GPU：我尽力了 😭", "要爆了 📢")),
+)
+RAM_BUCKETS: Buckets = (
+    (0, 25, ("内存很松 🫧", "还很空 😌", "随便开都行 🧃")),
+    (25, 55, ("占用正常 ✅", "稳稳的 🧘", "够用就好 🙂")),
+    (55, 75, ("开始拥挤了 🚶", "有点挤 😅", "注意后台 👀")),
+    (75, 90, ("内存吃紧 🧨", "要清理了 🧹", "后台太多了 😵")),
+    (90, 101, ("内存告急 🚨", "快溢出了 🫠", "请关闭点东西 😭")),
+)
 
 # ✅ DISK 文案：基于 (读+写) 的 MB/s 合计分档，保持短
-DISK_IO_BUCKETS: Buckets = [
-    (0, 0.3,   ["磁盘打盹 💤", "几乎不动 🤫", "空闲摸鱼 🫧"]),
-    (0.3, 5,   ["轻轻翻页 📄", "读写小忙 🧃", "稳稳的 🙂"]),
-    (5, 30,    ["读写加速 ⚙️", "缓存热身 🔥", "开始认真 🛠️"]),
-    (30, 120,  ["磁盘起飞 🚀", "吞吐拉满 💽", "别打扰我 😵"]),
-    (120, 1e9, ["IO 爆表 🚨", "疯狂读写 ☢️", "卡顿预警 ⚠️"]),
-]
+DISK_IO_BUCKETS: Buckets = (
+    (0, 0.3,   ("磁盘打盹 💤", "几乎不动 🤫", "空闲摸鱼 🫧")),
+    (0.3, 5,   ("轻轻翻页 📄", "读写小忙 🧃", "稳稳的 🙂")),
+    (5, 30,    ("读写加速 ⚙️", "缓存热身 🔥", "开始认真 🛠️")),
+    (30, 120,  ("磁盘起飞 🚀", "吞吐拉满 💽", "别打扰我 😵")),
+    (120, 1e9, ("IO 爆表 🚨", "疯狂读写 ☢️", "卡顿预警 ⚠️")),
+)
 
-MOOD_BUCKETS: Buckets = [
-    (0, 20,  ["摸鱼中 😴", "静默 🫧", "养生 🌿"]),
-    (20, 40, ["巡航 🛫", "小忙 🙂", "不慌 🧘"]),
-    (40, 60, ["认真 🛠️", "开工 ⚙️", "稳稳输出 ✅"]),
-    (60, 80, ["加速 🚀", "火力全开 💪", "起飞 ✈️"]),
-    (80, 101, ["爆肝 🔥", "快冒烟 🥵", "救命 🚨"]),
-]
+MOOD_BUCKETS: Buckets = (
+    (0, 20,  ("摸鱼中 😴", "静默 🫧", "养生 🌿")),
+    (20, 40, ("巡航 🛫", "小忙 🙂", "不慌 🧘")),
+    (40, 60, ("认真 🛠️", "开工 ⚙️", "稳稳输出 ✅")),
+    (60, 80, ("加速 🚀", "火力全开 💪", "起飞 ✈️")),
+    (80, 101, ("爆肝 🔥", "快冒烟 🥵", "救命 🚨")),
+)
+
+
+def _bucket_idx(lows: Tuple[float, ...], his: Tuple[float, ...], usage: float) -> int:
+    i = bisect_right(lows, usage) - 1
+    if i < 0 or not usage < his[i]:
+        i = len(lows) - 1
+    return i
 
 
-def _pick_bucket(buckets: Buckets, usage: float) -> Tuple[int, List[str]]:
-    for i, (lo, hi, texts) in enumerate(buckets):
-        if lo <= usage < hi:
-            return i, texts
-    return len(buckets) - 1, buckets[-1][2]
+def _prepare_buckets(buckets: Buckets):
+    """
+    (下界, 上界, 各档文案, 各档“换一句”备选, 整数直查表) —— 查表时不再现算。
+    分档边界全是从 0 开始的整数时（百分比类），floor(usage) 就能决定落在哪一档，
+    预先展开成 direct[int(usage)] -> 档位下标；否则 direct 为 None，走二分
+    """
+    lows = tuple(lo for lo, _, _ in buckets)
+    his = tuple(hi for _, hi, _ in buckets)
+    texts = tuple(t for _, _, t in buckets)
+    alts = tuple({p: tuple(q for q in ts if q != p) for p in ts} for ts in texts)
+
+    direct = None
+    if lows[0] == 0 and all(float(x).is_integer() for x in lows + his):
+        direct = tuple(_bucket_idx(lows, his, float(v)) for v in range(int(his[-1])))
+    return lows, his, texts, alts, direct
+
+
+# 所有档位表在导入时一次性整理好，按 kind 直接取；顺序即 pick_all 的顺序
+PHRASE_KINDS: Tuple[str, ...] = ("cpu", "gpu", "ram", "disk_io", "mood")
+PHRASE_TABLES = tuple(
+    _prepare_buckets(b)
+    for b in (CPU_BUCKETS, GPU_BUCKETS, RAM_BUCKETS, DISK_IO_BUCKETS, MOOD_BUCKETS)
+)
+_PHRASE_TABLE_BY_KIND = dict(zip(PHRASE_KINDS, PHRASE_TABLES))
+
+
+def _mood_score(cpu: float, gpu: float, ram: float, dr: float, dw: float,
+                up: float, down: float, net_sat: float) -> float:
+    disk_norm = min(100.0, ((dr + dw) / 200.0) * 100.0)  # 200MB/s ~= 100%
+    net_norm = min(100.0, ((up + down) / max(1e-6, net_sat)) * 100.0)
+    score = 0.28 * cpu + 0.28 * gpu + 0.22 * ram + 0.10 * disk_norm + 0.12 * net_norm
+    return max(0.0, min(100.0, score))
 
 
 class PhraseManager:
@@ -226,24 +352,36 @@ class PhraseManager:
     def __init__(self):
         self.state: Dict[str, Tuple[Optional[int], str]] = {}
 
-    def get(self, kind: str, usage: Optional[float], buckets: Buckets) -> str:
-        if usage is None:
+    def get(self, kind: str, usage: float) -> str:
+        if usage != usage:
             return "数据缺席 🤷"
 
-        idx, texts = _pick_bucket(buckets, float(usage))
+        lows, his, texts, alts, direct = _PHRASE_TABLE_BY_KIND[kind]
         last_idx, last_phrase = self.state.get(kind, (None, ""))
 
+        # 快路径：仍落在上次那一档里，直接复用
+        if last_idx is not None and last_phrase and lows[last_idx] <= usage < his[last_idx]:
+            return last_phrase
+
+        if direct is not None and 0 <= usage < len(direct):
+            idx = direct[int(usage)]
+        else:
+            idx = _bucket_idx(lows, his, usage)
         if last_idx == idx and last_phrase:
             return last_phrase
 
-        phrase = random.choice(texts)
-        if phrase == last_phrase and len(texts) > 1:
-            alt = [t for t in texts if t != last_phrase]
-            phrase = random.choice(alt)
+        options = texts[idx]
+        phrase = random.choice(options)
+        if phrase == last_phrase and len(options) > 1:
+            phrase = random.choice(alts[idx][phrase])
 
         self.state[kind] = (idx, phrase)
         return phrase
 
+    def pick_all(self, usages) -> List[str]:
+        """按 PHRASE_KINDS 的顺序一次取多项文案（usages 可以只给前几项）"""
+        return [self.get(kind, u) for kind, u in zip(PHRASE_KINDS, usages)]
+
 
 # -------------------------
 # Themes
@@ -279,6 +417,168 @@ THEMES: Dict[str, dict] = {
 }
 
 
+PANEL_QSS = """
+    #Panel {{
+        background: rgba({bg},{alpha});
+        border: 1px solid rgba({border});
+        border-radius: 16px;
+    }}
+    #PanelTitle {{
+        color: rgba({badge});
+        font-weight: 950;
+        letter-spacing: 0.4px;
+    }}
+    #PanelLine {{
+        color: rgba({value});
+        font-weight: 850;
+    }}
+    #PanelMood {{
+        color: rgba({value});
+        font-weight: 950;
+    }}
+"""
+
+
+def _qss_template(t: dict):
+    """主题颜色先代入，只留 alpha 给透明度滑块"""
+    def rgba(c) -> str:
+        return ",".join(str(x) for x in c)
+    return partial(
+        PANEL_QSS.format,
+        bg=rgba(t["bg"][:3]),
+        border=rgba(t["border"]),
+        badge=rgba(t["badge"]),
+        value=rgba(t["value"]),
+    )
+
+
+# -------------------------
+# Panel shadow (pre-rendered 9-slice)
+# -------------------------
+PANEL_RADIUS = 16
+SHADOW_SPREAD = 10
+SHADOW_OFFSET_Y = 5
+
+
+def _render_shadow_tile(rgba) -> QPixmap:
+    """
+    预渲染圆角矩形软阴影（9 宫格贴图），只在切换主题时生成一次；
+    由外向内叠加若干层低 alpha 圆角矩形，叠满后中心 alpha 等于主题阴影 alpha
+    """
+    spread, radius = SHADOW_SPREAD, PANEL_RADIUS
+    size = (spread + radius) * 2 + 1
+    r, g, b, a = rgba
+    layer_a = 1.0 - (1.0 - a / 255.0) ** (1.0 / spread)
+    color = QColor(r, g, b, max(1, round(255 * layer_a)))
+
+    img = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    img.fill(Qt.transparent)
+    p = QPainter(img)
+    p.setRenderHint(QPainter.Antialiasing)
+    p.setPen(Qt.NoPen)
+    p.setBrush(color)
+    for d in range(spread):
+        rad = radius + spread - d
+        p.drawRoundedRect(QRectF(d, d, size - 2 * d, size - 2 * d), rad, rad)
+    p.end()
+    return QPixmap.fromImage(img)
+
+
+def _draw_nine_slice(p: QPainter, target: QRect, pm: QPixmap, margin: int):
+    sw, sh = pm.width(), pm.height()
+    tx, ty, tw, th = target.x(), target.y(), target.width(), target.height()
+    dm = max(0, min(margin, tw // 2, th // 2))
+
+    cols = ((0, margin, tx, dm),
+            (margin, sw - 2 * margin, tx + dm, tw - 2 * dm),
+            (sw - margin, margin, tx + tw - dm, dm))
+    rows = ((0, margin, ty, dm),
+            (margin, sh - 2 * margin, ty + dm, th - 2 * dm),
+            (sh - margin, margin, ty + th - dm, dm))
+    for sx, sw_, dx, dw in cols:
+        for sy, sh_, dy, dh in rows:
+            if dw > 0 and dh > 0:
+                p.drawPixmap(QRect(dx, dy, dw, dh), pm, QRect(sx, sy, sw_, sh_))
+
+
+# -------------------------
+# Status lines
+# -------------------------
+class StatusLines(QWidget):
+    """
+    多行纯文本状态（替代一组 QLabel）：
+    - 每行一个 QStaticText，字形排版缓存到文本变化为止
+    - 只有内容变了的那一行才 setText + 局部重绘
+    颜色/字重仍由样式表 #PanelLine 决定（经 palette / font 生效）
+    """
+    def __init__(self, count: int, spacing: int = 6, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setObjectName("PanelLine")
+        self._spacing = spacing
+        self._texts = ["--"] * count
+        self._static: List[QStaticText] = []
+        for t in self._texts:
+            st = QStaticText(t)
+            st.setTextFormat(Qt.PlainText)
+            st.setPerformanceHint(QStaticText.AggressiveCaching)
+            self._static.append(st)
+        self._line_h = 0
+        self._max_w = 0
+        self._update_metrics()
+
+    def _update_metrics(self) -> bool:
+        fm = self.fontMetrics()
+        line_h = fm.height()
+        max_w = max(fm.horizontalAdvance(t) for t in self._texts)
+        changed = (line_h, max_w) != (self._line_h, self._max_w)
+        self._line_h, self._max_w = line_h, max_w
+        return changed
+
+    def _line_top(self, i: int) -> int:
+        return i * (self._line_h + self._spacing)
+
+    def sizeHint(self) -> QSize:
+        n = len(self._texts)
+        return QSize(self._max_w, n * self._line_h + (n - 1) * self._spacing)
+
+    def minimumSizeHint(self) -> QSize:
+        return self.sizeHint()
+
+    def changeEvent(self, e):
+        # 样式表里的 font-weight 会以 FontChange 的形式到达
+        if e.type() == QEvent.FontChange:
+            if self._update_metrics():
+                self.updateGeometry()
+            self.update()
+        super().changeEvent(e)
+
+    def set_lines(self, texts):
+        dirty = []
+        for i, new in enumerate(texts):
+            if self._texts[i] != new:
+                self._texts[i] = new
+                self._static[i].setText(new)
+                dirty.append(i)
+        if not dirty:
+            return
+
+        if self._update_metrics():
+            self.updateGeometry()
+            self.update()
+            return
+        w = self.width()
+        for i in dirty:
+            self.update(QRect(0, self._line_top(i), w, self._line_h))
+
+    def paintEvent(self, e):
+        p = QPainter(self)
+        p.setFont(self.font())
+        p.setPen(self.palette().color(QPalette.WindowText))
+        for i, st in enumerate(self._static):
+            p.drawStaticText(0, self._line_top(i), st)
+        p.end()
+
+
 # -------------------------
 # Panel
 # -------------------------
@@ -294,16 +594,9 @@ class Panel(QFrame):
         self.title = QLabel("⚡ Eric")
         self.title.setObjectName("PanelTitle")
 
-        self.line1 = QLabel("--")
-        self.line2 = QLabel("--")
-        self.line3 = QLabel("--")
-        self.line4 = QLabel("--")  # DISK
-        self.line5 = QLabel("--")  # NET
-
-        for lb in (self.line1, self.line2, self.line3, self.line4, self.line5):
-            lb.setObjectName("PanelLine")
-            lb.setWordWrap(False)
-            lb.setTextFormat(Qt.PlainText)
+        # CPU / GPU / RAM / DISK / NET
+        self.lines = StatusLines(5, spacing=lay.spacing())
+        self._last_mood = ""
 
         self.mood = QLabel("")
         self.mood.setObjectName("PanelMood")
@@ -318,51 +611,39 @@ class Panel(QFrame):
         self.mood.setGraphicsEffect(self._mood_glow)
 
         lay.addWidget(self.title)
-        lay.addWidget(self.line1)
-        lay.addWidget(self.line2)
-        lay.addWidget(self.line3)
-        lay.addWidget(self.line4)
-        lay.addWidget(self.line5)
+        lay.addWidget(self.lines)
         lay.addStretch(1)
         lay.addWidget(self.mood)
 
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(20)
-        shadow.setOffset(0, 5)
-        self._shadow = shadow
-        self.setGraphicsEffect(self._shadow)
-
         f = self.mood.font()
         f.setPointSize(11)
         f.setBold(True)
         self.mood.setFont(f)
 
-    def set_shadow_color(self, rgba):
-        self._shadow.setColor(QColor(*rgba))
-
     def set_mood_glow(self, rgba):
         self._mood_glow.setColor(QColor(*rgba))
 
+    def set_effects_enabled(self, enabled: bool):
+        # 高斯辉光每帧都要在 CPU 上重算模糊，动画期间先关掉
+        self._mood_glow.setEnabled(enabled)
+
     def set_lines(self, a: str, b: str, c: str, d: str, e: str):
-        self.line1.setText(a)
-        self.line2.setText(b)
-        self.line3.setText(c)
-        self.line4.setText(d)
-        self.line5.setText(e)
+        self.lines.set_lines((a, b, c, d, e))
+
+    def _set_mood_text(self, text: str):
+        if self._last_mood != text:
+            self.mood.setText(text)
+            self._last_mood = text
 
     def set_collapsed_mode(self, collapsed: bool, vertical_text: str = ""):
         self.title.setVisible(not collapsed)
-        self.line1.setVisible(not collapsed)
-        self.line2.setVisible(not collapsed)
-        self.line3.setVisible(not collapsed)
-        self.line4.setVisible(not collapsed)
-        self.line5.setVisible(not collapsed)
+        self.lines.setVisible(not collapsed)
 
         self.mood.setVisible(collapsed)
         if collapsed:
-            self.mood.setText("\n".join(list(vertical_text)) if vertical_text else "")
+            self._set_mood_text("\n".join(list(vertical_text)) if vertical_text else "")
         else:
-            self.mood.setText("")
+            self._set_mood_text("")
 
 
 # -------------------------
@@ -373,6 +654,7 @@ class Overlay(QWidget):
 
     AUTOHIDE_DELAY_MS = 900
     POLL_MS = 80
+    REFRESH_MS = 1000
     HOVER_PAD_PX = 16
 
     NET_SAT_MB_S = 50.0
@@ -404,6 +686,31 @@ class Overlay(QWidget):
         self.opacity_pct = int(self.settings.value("opacity", 75))
         self.click_through = bool(self.settings.value("click_through", False, type=bool))
         self.auto_hide = bool(self.settings.value("auto_hide", True, type=bool))
+        self._applied_theme: Optional[Tuple[str, int]] = None
+        self._qss_template = None
+        self._shadow_tile: Optional[QPixmap] = None
+
+        self._pos_flush = QTimer(self)
+        self._pos_flush.setSingleShot(True)
+        self._pos_flush.setInterval(500)
+        self._pos_flush.timeout.connect(self._flush_pos)
+
+        self._opacity_apply = QTimer(self)
+        self._opacity_apply.setSingleShot(True)
+        self._opacity_apply.setInterval(50)
+        self._opacity_apply.timeout.connect(self.apply_theme)
+
+        # 屏幕可用区域 / 字体度量缓存：收起/展开时会被反复查询
+        self._geo_screen = None
+        self._screen_geo = QRect()
+        self._refresh_screen_geo()
+        app = QApplication.instance()
+        app.primaryScreenChanged.connect(self._refresh_screen_geo)
+        app.screenAdded.connect(self._refresh_screen_geo)
+        app.screenRemoved.connect(self._refresh_screen_geo)
+
+        self._mood_fm: Optional[QFontMetrics] = None
+        self._mood_w_cache: Dict[str, int] = {}
 
         self.expanded_geo: Optional[QRect] = None
         self.collapsed = False
@@ -417,27 +724,38 @@ class Overlay(QWidget):
         self.disk_rate = DiskRateReader()
         self.phrases = PhraseManager()
 
-        self.last_cpu: Optional[float] = None
-        self.last_gpu: Optional[float] = None
-        self.last_ram: Optional[float] = None
-        self.last_disk_r: Optional[float] = None
-        self.last_disk_w: Optional[float] = None
-        self.last_up: Optional[float] = None
-        self.last_down: Optional[float] = None
-
-        self._anim_group = QParallelAnimationGroup(self)
-
-        self._geo_anim = QPropertyAnimation(self, b"geometry", self)
-        self._geo_anim.setDuration(self.ANIM_MS)
-        self._geo_anim.setEasingCurve(self.ANIM_EASE)
-
-        self._opa_anim = QPropertyAnimation(self, b"windowOpacity", self)
-        self._opa_anim.setDuration(self.ANIM_MS)
-        self._opa_anim.setEasingCurve(QEasingCurve.OutCubic)
-
-        self._anim_group.addAnimation(self._geo_anim)
-        self._anim_group.addAnimation(self._opa_anim)
-        self._anim_group.finished.connect(self._on_anim_finished)
+        self.last_cpu = math.nan
+        self.last_gpu = math.nan
+        self.last_ram = math.nan
+        self.last_disk_r = math.nan
+        self.last_disk_w = math.nan
+        self.last_up = math.nan
+        self.last_down = math.nan
+
+        self._mood_inputs: Optional[tuple] = None
+        self._mood_phrase = ""
+
+        self._last_lines: Optional[Tuple[str, ...]] = None
+        self._last_mood = ""
+
+        # 单个 0→1 进度动画同时驱动几何与透明度；每帧只在取整后的值真正变化时
+        # 才去碰分层窗口，避免重复的 setGeometry / setWindowOpacity
+        self._anim = QVariantAnimation(self)
+        self._anim.setDuration(self.ANIM_MS)
+        self._anim.setStartValue(0.0)
+        self._anim.setEndValue(1.0)
+        self._anim.valueChanged.connect(self._on_anim_step)
+        self._anim.finished.connect(self._on_anim_finished)
+
+        self._geo_ease = QEasingCurve(self.ANIM_EASE)
+        self._opa_ease = QEasingCurve(QEasingCurve.OutCubic)
+
+        self._anim_start_geo = QRect()
+        self._anim_end_geo = QRect()
+        self._anim_start_op = self.EXPANDED_OPACITY
+        self._anim_end_op = self.EXPANDED_OPACITY
+        self._anim_last_geo = QRect()
+        self._anim_last_alpha = -1
 
         self._anim_target_collapsed: Optional[bool] = None
         self._anim_inflight = False
@@ -459,18 +777,21 @@ class Overlay(QWidget):
         self.adjustSize()
         self._restore_or_default_pos()
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh)
-        self.timer.start(1000)
-        self.refresh()
-
-        self.poll = QTimer(self)
-        self.poll.timeout.connect(self._poll_mouse)
-        self.poll.start(self.POLL_MS)
-
-        self._collapse_timer = QTimer(self)
-        self._collapse_timer.setSingleShot(True)
-        self._collapse_timer.timeout.connect(self._collapse_if_still_far)
+        # 只用一个 80ms 驱动定时器：每拍轮询鼠标、倒数自动收起；
+        # 传感器数据由后台线程按 REFRESH_MS 推送过来
+        self._collapse_remaining_ticks = 0
+        self._tick = QTimer(self)
+        self._tick.timeout.connect(self._on_tick)
+        self._tick.start(self.POLL_MS)
+
+        self._sensor_thread = QThread(self)
+        self._sensor_worker = SensorWorker(self.lhm, self.psr, self.disk_rate, self.REFRESH_MS)
+        self._sensor_worker.moveToThread(self._sensor_thread)
+        self._sensor_thread.started.connect(self._sensor_worker.start)
+        self._sensor_thread.finished.connect(self._sensor_worker.deleteLater)
+        self._sensor_worker.readings.connect(self.refresh, Qt.QueuedConnection)
+        self._sensor_thread.start()
+        QApplication.instance().aboutToQuit.connect(self.shutdown)
 
         self._init_tray()
         self._init_hotkeys()
@@ -478,6 +799,30 @@ class Overlay(QWidget):
         QTimer.singleShot(60, lambda: set_click_through(self, self.click_through))
         QTimer.singleShot(300, self._maybe_autocollapse_on_start)
 
+    def _on_tick(self):
+        if self._collapse_remaining_ticks > 0:
+            self._collapse_remaining_ticks -= 1
+            if self._collapse_remaining_ticks == 0:
+                self._collapse_if_still_far()
+
+        self._poll_mouse()
+
+    def shutdown(self):
+        if self._pos_flush.isActive():
+            self._pos_flush.stop()
+            self._flush_pos()
+        self._sensor_thread.quit()
+        # 等不到线程退出说明它还卡在 LHM 读取里，这时不能去关 Computer
+        if self._sensor_thread.wait(3000):
+            self.lhm.close()
+
+    def _arm_collapse(self):
+        if self._collapse_remaining_ticks == 0:
+            self._collapse_remaining_ticks = max(1, -(-self.AUTOHIDE_DELAY_MS // self.POLL_MS))
+
+    def _cancel_collapse(self):
+        self._collapse_remaining_ticks = 0
+
     def _is_effectively_collapsed(self) -> bool:
         if self._anim_inflight and self._anim_target_collapsed is not None:
             return bool(self._anim_target_collapsed)
@@ -485,6 +830,7 @@ class Overlay(QWidget):
 
     def _on_anim_finished(self):
         self._anim_inflight = False
+        self.panel.set_effects_enabled(True)
         if self._anim_target_collapsed is True:
             self.collapsed = True
             self.setWindowOpacity(self.COLLAPSED_OPACITY)
@@ -496,20 +842,64 @@ class Overlay(QWidget):
     def _start_anim(self, start_geo: QRect, end_geo: QRect, start_op: float, end_op: float, target_collapsed: bool):
         if self._anim_inflight:
             try:
-                self._anim_group.stop()
+                self._anim.stop()
             except Exception:
                 pass
         self._anim_inflight = True
         self._anim_target_collapsed = target_collapsed
-
-        self._geo_anim.setStartValue(start_geo)
-        self._geo_anim.setEndValue(end_geo)
-        self._opa_anim.setStartValue(float(start_op))
-        self._opa_anim.setEndValue(float(end_op))
-        self._anim_group.start()
+        self.panel.set_effects_enabled(False)
+
+        self._anim_start_geo = QRect(start_geo)
+        self._anim_end_geo = QRect(end_geo)
+        self._anim_start_op = float(start_op)
+        self._anim_end_op = float(end_op)
+        self._anim_last_geo = QRect(start_geo)
+        self._anim_last_alpha = -1
+        self._anim.start()
+
+    def _on_anim_step(self, t):
+        t = float(t)
+        k = self._geo_ease.valueForProgress(t)
+        a = self._anim_start_geo
+        b = self._anim_end_geo
+        geo = QRect(
+            round(a.x() + (b.x() - a.x()) * k),
+            round(a.y() + (b.y() - a.y()) * k),
+            round(a.width() + (b.width() - a.width()) * k),
+            round(a.height() + (b.height() - a.height()) * k),
+        )
+        if geo != self._anim_last_geo:
+            self._anim_last_geo = geo
+            self.setGeometry(geo)
+
+        # 分层窗口的 alpha 只有 8 位，按 1/255 取整后再决定要不要更新
+        op = self._anim_start_op + (self._anim_end_op - self._anim_start_op) * self._opa_ease.valueForProgress(t)
+        alpha = round(op * 255)
+        if alpha != self._anim_last_alpha:
+            self._anim_last_alpha = alpha
+            self.setWindowOpacity(alpha / 255)
+
+    def _refresh_screen_geo(self, *_):
+        screen = QApplication.primaryScreen()
+        if screen is None:
+            return
+        if screen is not self._geo_screen:
+            if self._geo_screen is not None:
+                try:
+                    self._geo_screen.availableGeometryChanged.disconnect(self._refresh_screen_geo)
+                except Exception:
+                    pass
+            screen.availableGeometryChanged.connect(self._refresh_screen_geo)
+            self._geo_screen = screen
+        self._screen_geo = screen.availableGeometry()
 
     def _screen(self):
-        return QApplication.primaryScreen().availableGeometry()
+        return self._screen_geo
+
+    def _mood_metrics(self) -> QFontMetrics:
+        if self._mood_fm is None:
+            self._mood_fm = QFontMetrics(self.panel.mood.font())
+        return self._mood_fm
 
     def _decide_nearest_side(self, rect: QRect) -> str:
         s = self._screen()
@@ -520,21 +910,21 @@ class Overlay(QWidget):
         max_h = int(s.height() * self.COLLAPSED_MAX_H_RATIO)
 
         n = max(1, len(mood_text))
-        fm = QFontMetrics(self.panel.mood.font())
-        line_h = fm.height()
+        line_h = self._mood_metrics().height()
 
         pad = 30
         h = pad + int(n * line_h * 1.05)
         return clamp(h, self.COLLAPSED_MIN_H, max_h)
 
     def _calc_collapsed_width_for_text(self, mood_text: str) -> int:
-        fm = QFontMetrics(self.panel.mood.font())
-        max_char_w = 0
-        for ch in (mood_text or " "):
-            r = fm.boundingRect(ch)
-            max_char_w = max(max_char_w, r.width())
-        w = int(max_char_w + 18)
-        return clamp(w, self.COLLAPSED_MIN_W, self.COLLAPSED_MAX_W)
+        # 文案集合是有限的，按文本缓存宽度，同一句不再逐字量一遍
+        w = self._mood_w_cache.get(mood_text)
+        if w is None:
+            fm = self._mood_metrics()
+            max_char_w = max(fm.boundingRect(ch).width() for ch in set(mood_text or " "))
+            w = clamp(int(max_char_w + 18), self.COLLAPSED_MIN_W, self.COLLAPSED_MAX_W)
+            self._mood_w_cache[mood_text] = w
+        return w
 
     def _collapsed_rect_for(self, expanded: QRect, side: str, collapsed_w: int, collapsed_h: int) -> QRect:
         s = self._screen()
@@ -547,21 +937,30 @@ class Overlay(QWidget):
 
         return QRect(x, y, collapsed_w, collapsed_h)
 
-    def _hover_region_rect(self) -> QRect:
+    def _cursor_in_geom(self, pad: int = 0) -> bool:
+        # 直接比较坐标，轮询时不再每拍构造 adjusted() / 命中区 QRect
         g = self.geometry()
-        pad = self.HOVER_PAD_PX
-        return QRect(g.x() - pad, g.y() - pad, g.width() + 2 * pad, g.height() + 2 * pad)
-
-    def _cursor_in_rect(self, r: QRect, pad: int = 0) -> bool:
         p = QCursor.pos()
-        return r.adjusted(-pad, -pad, pad, pad).contains(p)
+        x, y = p.x(), p.y()
+        gx, gy = g.x(), g.y()
+        return (gx - pad <= x < gx + g.width() + pad) and (gy - pad <= y < gy + g.height() + pad)
 
     def _restore_or_default_pos(self):
         screen = self._screen()
-        pos = self.settings.value("pos", None)
-        if pos:
+        x = y = None
+        if self.settings.contains("pos_x") and self.settings.contains("pos_y"):
+            x = self.settings.value("pos_x", 0, type=int)
+            y = self.settings.value("pos_y", 0, type=int)
+        else:
+            # 兼容旧版本保存的 "x,y" 字符串
+            pos = self.settings.value("pos", None)
+            if pos:
+                try:
+                    x, y = map(int, str(pos).split(","))
+                except Exception:
+                    pass
+        if x is not None and y is not None:
             try:
-                x, y = map(int, str(pos).split(","))
                 self.move(x, y)
                 g = self.geometry()
                 nx = clamp(g.x(), screen.left(), screen.right() - g.width())
@@ -573,40 +972,62 @@ class Overlay(QWidget):
         self.move(screen.right() - self.width() - 10, screen.top() + 10)
 
     def _persist_pos(self):
-        p = self.pos()
-        self.settings.setValue("pos", f"{p.x()},{p.y()}")
+        # 合并拖动松手 + 动画结束等连续写入：500ms 内只落一次盘（Windows 上是注册表）
+        self._pos_flush.start()
+
+    def _flush_pos(self):
+        # 收起（或正在收起）时窗口停在边缘条的位置，保存的应是用户摆放的展开位置
+        if (self.collapsed or self._anim_target_collapsed) and self.expanded_geo is not None:
+            p = self.expanded_geo.topLeft()
+        else:
+            p = self.pos()
+        self.settings.setValue("pos_x", p.x())
+        self.settings.setValue("pos_y", p.y())
 
     def apply_theme(self):
-        t = THEMES.get(self.theme_key, THEMES["mica"])
-        alpha = int(255 * clamp(self.opacity_pct, 30, 95) / 100)
+        key = (self.theme_key, self.opacity_pct)
+        if key == self._applied_theme:
+            return
+        theme_changed = self._applied_theme is None or self._applied_theme[0] != self.theme_key
+        self._applied_theme = key
+
+        if theme_changed:
+            t = THEMES.get(self.theme_key, THEMES["mica"])
+            self._qss_template = _qss_template(t)
+            self._mood_fm = None
+            self._mood_w_cache.clear()
 
-        self.setStyleSheet(f"""
-            #Panel {{
-                background: rgba({t['bg'][0]},{t['bg'][1]},{t['bg'][2]},{alpha});
-                border: 1px solid rgba({t['border'][0]},{t['border'][1]},{t['border'][2]},{t['border'][3]});
-                border-radius: 16px;
-            }}
-            #PanelTitle {{
-                color: rgba({t['badge'][0]},{t['badge'][1]},{t['badge'][2]},{t['badge'][3]});
-                font-weight: 950;
-                letter-spacing: 0.4px;
-            }}
-            #PanelLine {{
-                color: rgba({t['value'][0]},{t['value'][1]},{t['value'][2]},{t['value'][3]});
-                font-weight: 850;
-            }}
-            #PanelMood {{
-                color: rgba({t['value'][0]},{t['value'][1]},{t['value'][2]},{t['value'][3]});
-                font-weight: 950;
-            }}
-        """)
-
-        self.panel.set_shadow_color((*t["shadow"][:3], t["shadow"][3]))
-        self.panel.set_mood_glow((*t["glow"][:3], t["glow"][3]))
-
-        self.settings.setValue("theme", self.theme_key)
+            self._shadow_tile = _render_shadow_tile(t["shadow"])
+            self.update()
+            self.panel.set_mood_glow((*t["glow"][:3], t["glow"][3]))
+            self.settings.setValue("theme", self.theme_key)
+
+        alpha = int(255 * clamp(self.opacity_pct, 30, 95) / 100)
+        self.setStyleSheet(self._qss_template(alpha=alpha))
         self.settings.setValue("opacity", int(self.opacity_pct))
 
+    def paintEvent(self, e):
+        # 面板阴影：贴预渲染的 9 宫格图，不再对面板像素做实时高斯模糊
+        if self._shadow_tile is None or not self.panel.isVisible():
+            return
+        spread = SHADOW_SPREAD
+        panel_geo = self.panel.geometry()
+        target = panel_geo.adjusted(-spread, -spread, spread, spread).translated(0, SHADOW_OFFSET_Y)
+
+        # 只画面板外的一圈：面板背景是半透明的，阴影铺进面板底下会把它压暗/染色，
+        # 透明度滑块调低时尤其明显
+        clip = QPainterPath()
+        clip.addRect(QRectF(target))
+        inner = QPainterPath()
+        inner.addRoundedRect(QRectF(panel_geo), PANEL_RADIUS, PANEL_RADIUS)
+
+        p = QPainter(self)
+        p.setRenderHint(QPainter.SmoothPixmapTransform)
+        p.setRenderHint(QPainter.Antialiasing)
+        p.setClipPath(clip.subtracted(inner))
+        _draw_nine_slice(p, target, self._shadow_tile, spread + PANEL_RADIUS)
+        p.end()
+
     def mousePressEvent(self, e):
         if self.click_through or self._anim_inflight:
             return
@@ -631,16 +1052,15 @@ class Overlay(QWidget):
     def _schedule_collapse_if_far(self):
         if (not self.auto_hide) or self._anim_inflight:
             return
-        if self._cursor_in_rect(self.geometry(), pad=6):
-            self._collapse_timer.stop()
+        if self._cursor_in_geom(pad=6):
+            self._cancel_collapse()
             return
-        if not self._collapse_timer.isActive():
-            self._collapse_timer.start(self.AUTOHIDE_DELAY_MS)
+        self._arm_collapse()
 
     def _collapse_if_still_far(self):
         if (not self.auto_hide) or self._anim_inflight:
             return
-        if self._cursor_in_rect(self.geometry(), pad=6):
+        if self._cursor_in_geom(pad=6):
             self._schedule_collapse_if_far()
             return
         self.collapse_to_edge_animated()
@@ -650,34 +1070,28 @@ class Overlay(QWidget):
             return
 
         if self.collapsed:
-            if self._hover_region_rect().contains(QCursor.pos()):
+            if self._cursor_in_geom(pad=self.HOVER_PAD_PX):
                 self.expand_animated()
             return
 
-        if not self._cursor_in_rect(self.geometry(), pad=6):
-            if not self._collapse_timer.isActive():
-                self._collapse_timer.start(self.AUTOHIDE_DELAY_MS)
+        if not self._cursor_in_geom(pad=6):
+            self._arm_collapse()
         else:
-            self._collapse_timer.stop()
+            self._cancel_collapse()
 
     def _compute_mood_phrase(self) -> str:
-        cpu = self.last_cpu if self.last_cpu is not None else 0.0
-        gpu = self.last_gpu if self.last_gpu is not None else 0.0
-        ram = self.last_ram if self.last_ram is not None else 0.0
-
-        dr = self.last_disk_r if self.last_disk_r is not None else 0.0
-        dw = self.last_disk_w if self.last_disk_w is not None else 0.0
-        disk_mb_s = dr + dw
-        disk_norm = min(100.0, (disk_mb_s / 200.0) * 100.0)  # 200MB/s ~= 100%
+        # 输入没变时得分、档位、文案都不会变，直接复用上次结果
+        inputs = (self.last_cpu, self.last_gpu, self.last_ram,
+                  self.last_disk_r, self.last_disk_w, self.last_up, self.last_down)
+        if inputs == self._mood_inputs and self._mood_phrase:
+            return self._mood_phrase
 
-        up = self.last_up if self.last_up is not None else 0.0
-        down = self.last_down if self.last_down is not None else 0.0
-        net = up + down
-        net_norm = min(100.0, (net / max(1e-6, self.NET_SAT_MB_S)) * 100.0)
+        cpu, gpu, ram, dr, dw, up, down = (0.0 if v != v else v for v in inputs)
+        score = _mood_score(cpu, gpu, ram, dr, dw, up, down, self.NET_SAT_MB_S)
 
-        score = 0.28 * cpu + 0.28 * gpu + 0.22 * ram + 0.10 * disk_norm + 0.12 * net_norm
-        score = max(0.0, min(100.0, score))
-        return self.phrases.get("mood", score, MOOD_BUCKETS)
+        self._mood_inputs = inputs
+        self._mood_phrase = self.phrases.get("mood", score)
+        return self._mood_phrase
 
     def collapse_to_edge_animated(self):
         if self.collapsed:
@@ -691,6 +1105,7 @@ class Overlay(QWidget):
         self._anim_target_collapsed = True
         self.collapsed = True
         self.panel.set_collapsed_mode(True, mood)
+        self._last_mood = mood
 
         collapsed_h = self._calc_collapsed_height_for_text(mood)
         collapsed_w = self._calc_collapsed_width_for_text(mood)
@@ -715,6 +1130,7 @@ class Overlay(QWidget):
         self._anim_target_collapsed = False
         self.collapsed = False
         self.panel.set_collapsed_mode(False)
+        self._last_mood = ""
 
         s = self._screen()
         g = self.expanded_geo
@@ -874,34 +1290,24 @@ class Overlay(QWidget):
         self._sync_tray_checks()
 
     def set_opacity_pct(self, v: int):
+        # 拖动滑块时 valueChanged 很密，最多每 50ms 真正应用一次样式表
         self.opacity_pct = clamp(int(v), 30, 95)
-        self.apply_theme()
+        if not self._opacity_apply.isActive():
+            self._opacity_apply.start()
 
     # ---------- refresh ----------
-    def refresh(self):
-        lhm = self.lhm.read()
-        psu = self.psr.read()
+    @Slot(dict)
+    def refresh(self, data: dict):
+        nan = math.nan
+        cpu_usage = data.get("cpu_usage", nan)
+        gpu_usage = data.get("gpu_load", nan)
+        ram_usage = data.get("ram_usage", nan)
 
-        cpu_usage = psu.get("cpu_usage")
-        if cpu_usage is None:
-            try:
-                cpu_usage = float(psutil.cpu_percent(interval=None))
-            except Exception:
-                cpu_usage = 0.0
+        disk_r = data.get("disk_r", nan)
+        disk_w = data.get("disk_w", nan)
 
-        gpu_usage = lhm.get("gpu_load")
-
-        ram_usage = psu.get("ram_usage")
-        if ram_usage is None:
-            try:
-                ram_usage = float(psutil.virtual_memory().percent)
-            except Exception:
-                ram_usage = None
-
-        disk_r, disk_w = self.disk_rate.read()
-
-        up = psu.get("net_up_mb_s")
-        down = psu.get("net_down_mb_s")
+        up = data.get("net_up_mb_s", nan)
+        down = data.get("net_down_mb_s", nan)
 
         self.last_cpu = cpu_usage
         self.last_gpu = gpu_usage
@@ -911,27 +1317,31 @@ class Overlay(QWidget):
         self.last_up = up
         self.last_down = down
 
-        cpu_txt = self.phrases.get("cpu", cpu_usage, CPU_BUCKETS)
-        gpu_txt = self.phrases.get("gpu", gpu_usage, GPU_BUCKETS)
-        ram_txt = self.phrases.get("ram", ram_usage, RAM_BUCKETS)
-
         # ✅ DISK 趣味文案（跨档稳定）：基于读写合计 MB/s
-        disk_total = None if (disk_r is None or disk_w is None) else float(disk_r + disk_w)
-        disk_txt = self.phrases.get("disk_io", disk_total, DISK_IO_BUCKETS)
+        # 任一为 nan 时合计也是 nan，文案走“数据缺席”
+        disk_total = disk_r + disk_w
+        cpu_txt, gpu_txt, ram_txt, disk_txt = self.phrases.pick_all((cpu_usage, gpu_usage, ram_usage, disk_total))
 
-        # ✅ DISK：超短读/写速度（MB/s），读/写
-        disk_str = f"{fmt_rate_short(disk_r)}/{fmt_rate_short(disk_w)}"
+        pct, rate_short, rate_mb_s = fmt_pct, fmt_rate_short, fmt_rate_mb_s
 
-        line1 = f"CPU   {fmt_pct(cpu_usage)}  {cpu_txt}"
-        line2 = f"GPU   {fmt_pct(gpu_usage)}  {gpu_txt}"
-        line3 = f"RAM   {fmt_pct(ram_usage)}  {ram_txt}"
-        line4 = f"DISK  {disk_str}  {disk_txt}"
-        line5 = f"网络  ↑{fmt_rate_mb_s(up)}  ↓{fmt_rate_mb_s(down)}"
+        line1 = _LINE1(pct(cpu_usage), cpu_txt)
+        line2 = _LINE2(pct(gpu_usage), gpu_txt)
+        line3 = _LINE3(pct(ram_usage), ram_txt)
+        # ✅ DISK：超短读/写速度（MB/s），读/写
+        line4 = _LINE4(rate_short(disk_r), rate_short(disk_w), disk_txt)
+        line5 = _LINE5(rate_mb_s(up), rate_mb_s(down))
 
+        # 显示内容没变就整条跳过，连 Panel 都不碰
         if not self._is_effectively_collapsed():
-            self.panel.set_lines(line1, line2, line3, line4, line5)
+            lines = (line1, line2, line3, line4, line5)
+            if lines != self._last_lines:
+                self.panel.set_lines(*lines)
+                self._last_lines = lines
         else:
-            self.panel.set_collapsed_mode(True, self._compute_mood_phrase())
+            mood = self._compute_mood_phrase()
+            if mood != self._last_mood:
+                self.panel.set_collapsed_mode(True, mood)
+                self._last_mood = mood
 
 
 def main():
@@ -939,6 +1349,10 @@ def main():
     app.setQuitOnLastWindowClosed(False)
     w = Overlay()
     w.show()
+    # 启动期建好的对象（LHM 硬件/传感器包装、主题表、文案表、Qt 包装）之后基本不再释放，
+    # 挪进永久代，之后的循环 GC 就不用每轮都遍历它们
+    gc.collect()
+    gc.freeze()
     sys.exit(app.exec())
 
 
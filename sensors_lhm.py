@@ -1,5 +1,9 @@
+from __future__ import annotations
+
+import math
 import os
-from typing import Dict, Optional
+from array import array
+from typing import Callable, Dict, List, Tuple
 
 import clr  # pythonnet
 
@@ -9,12 +13,111 @@ clr.AddReference(DLL_PATH)
 from LibreHardwareMonitor.Hardware import Computer, HardwareType, SensorType  # type: ignore
 
 
-def _sensor_value(sensor) -> Optional[float]:
+def _sensor_value(sensor) -> float:
     try:
         v = sensor.Value
-        return float(v) if v is not None else None
+        return float(v) if v is not None else math.nan
     except Exception:
-        return None
+        return math.nan
+
+
+class Idx:
+    """LhmReader.read() 返回数组里各读数的下标"""
+    CPU_TEMP = 0
+    CPU_POWER = 1
+    CPU_FREQ = 2
+    CPU_LOAD = 3
+
+    GPU_TEMP = 4
+    GPU_POWER = 5
+    GPU_FREQ = 6
+    GPU_LOAD = 7
+    GPU_VRAM_USED = 8   # MB (如可用)
+    GPU_VRAM_TOTAL = 9  # MB (如可用)
+
+    DISK_TEMP = 10
+    DISK_LOAD = 11
+
+    COUNT = 12
+
+
+# 同一读数多个传感器时的合并方式：
+# - "last": 后出现的非 0 值覆盖前面的
+# - "max":  取最大值（频率）
+_LAST = "last"
+_MAX = "max"
+
+Binding = Tuple[object, int, str]
+
+
+# 以下匹配函数只在初始化时跑一次：每个传感器的 Name 只转一次小写、
+# SensorType 只取一次（都是跨 CLR 的属性访问）
+
+
+def _bind_cpu(h, out: List[Binding]):
+    for s in h.Sensors:
+        st = s.SensorType
+        name = (s.Name or "").lower()
+        if st == SensorType.Temperature and "package" in name:
+            out.append((s, Idx.CPU_TEMP, _LAST))
+        elif st == SensorType.Power and "package" in name:
+            out.append((s, Idx.CPU_POWER, _LAST))
+        elif st == SensorType.Clock and "core" in name:
+            # 取一个代表性的 core clock（也可以改成平均）
+            out.append((s, Idx.CPU_FREQ, _MAX))
+        elif st == SensorType.Load and "total" in name:
+            out.append((s, Idx.CPU_LOAD, _LAST))
+
+
+def _bind_gpu(h, out: List[Binding]):
+    for s in h.Sensors:
+        st = s.SensorType
+        name = (s.Name or "").lower()
+        if st == SensorType.Temperature and ("gpu" in name or "core" in name):
+            out.append((s, Idx.GPU_TEMP, _LAST))
+        elif st == SensorType.Power and ("gpu" in name or "package" in name or "total" in name):
+            out.append((s, Idx.GPU_POWER, _LAST))
+        elif st == SensorType.Clock and ("core" in name):
+            out.append((s, Idx.GPU_FREQ, _MAX))
+        elif st == SensorType.Load and ("core" in name or "gpu" in name or "total" in name):
+            out.append((s, Idx.GPU_LOAD, _LAST))
+        elif st == SensorType.SmallData:
+            # LHM 有时会把显存用量放 SmallData（取决于实现/驱动）
+            if "memory used" in name or "vram used" in name:
+                out.append((s, Idx.GPU_VRAM_USED, _LAST))
+            if "memory total" in name or "vram total" in name:
+                out.append((s, Idx.GPU_VRAM_TOTAL, _LAST))
+
+
+def _bind_storage(h, out: List[Binding]):
+    for s in h.Sensors:
+        st = s.SensorType
+        name = (s.Name or "").lower()
+        if st == SensorType.Temperature and ("temperature" in name or "drive" in name):
+            out.append((s, Idx.DISK_TEMP, _LAST))
+        elif st == SensorType.Load and ("used space" in name or "activity" in name or "total" in name):
+            out.append((s, Idx.DISK_LOAD, _LAST))
+
+
+# 各类硬件每隔几次 read() 才 Update 一次
+POLL_PERIOD_CPU = 1
+POLL_PERIOD_GPU = 2
+POLL_PERIOD_STORAGE = 5
+
+# read(need=...) 的类别位：不需要的类别既不 Update 也不取值（保持 nan）
+NEED_CPU = 1
+NEED_GPU = 2
+NEED_STORAGE = 4
+NEED_ALL = NEED_CPU | NEED_GPU | NEED_STORAGE
+
+# HardwareType -> (传感器匹配函数, Update 周期, 类别位)；不在表里的硬件不读
+_HW_HANDLERS: Dict[object, Tuple[Callable[[object, List[Binding]], None], int, int]] = {
+    HardwareType.Cpu: (_bind_cpu, POLL_PERIOD_CPU, NEED_CPU),
+    HardwareType.GpuNvidia: (_bind_gpu, POLL_PERIOD_GPU, NEED_GPU),
+    HardwareType.GpuAmd: (_bind_gpu, POLL_PERIOD_GPU, NEED_GPU),
+    HardwareType.GpuIntel: (_bind_gpu, POLL_PERIOD_GPU, NEED_GPU),
+    HardwareType.Storage: (_bind_storage, POLL_PERIOD_STORAGE, NEED_STORAGE),
+}
 
 
 class LhmReader:
@@ -23,6 +126,8 @@ class LhmReader:
     - CPU: 温度、频率、功耗、使用率(部分机器可能有 Load 传感器)
     - GPU: 温度、频率、功耗、显存使用(部分机型)、使用率
     - 硬盘: 温度、使用率(有的能读到)
+
+    硬件列表和要读的传感器在初始化时枚举并匹配一次，read() 只做 Update + 取值
     """
     def __init__(self):
         self.comp = Computer()
@@ -33,94 +138,67 @@ class LhmReader:
         self.comp.IsNetworkEnabled = False  # 网络速度用 psutil 更可靠
         self.comp.Open()
 
+        self.values = array("d", [math.nan] * Idx.COUNT)
+        self._blank = array("d", [math.nan] * Idx.COUNT)
+
+        self._tick = 0
+        self._hw_list: List[Tuple[object, int, int]] = []
+        self._bindings: List[Tuple[object, int, str, int]] = []
+        for hw in self.comp.Hardware:
+            hw.Update()
+            # 有些硬件有子硬件（比如 CPU Package/核心、GPU 多个节点）
+            sub_hws = list(hw.SubHardware) if getattr(hw, "SubHardware", None) else []
+            for shw in sub_hws:
+                shw.Update()
+
+            for h in [hw] + sub_hws:
+                handler = _HW_HANDLERS.get(h.HardwareType)
+                if handler is None:
+                    continue
+                bind, period, bit = handler
+                found: List[Binding] = []
+                bind(h, found)
+                # 没有任何要读的传感器，就不必每拍 Update
+                if found:
+                    self._hw_list.append((h, period, bit))
+                    self._bindings.extend((s, idx, reducer, bit) for s, idx, reducer in found)
+
     def close(self):
         try:
             self.comp.Close()
         except Exception:
             pass
 
-    def read(self) -> Dict[str, Optional[float]]:
+    def read(self, need: int = NEED_ALL) -> array:
         """
-        返回扁平字典，单位：
+        原地刷新并返回 self.values（按 Idx 取值，读不到或未请求的为 nan）。
+        need 为 NEED_* 位组合，只 Update / 读取这些类别的硬件。单位：
         - 温度: °C
         - 频率: MHz
         - 功耗: W
         - 使用率: %
         - 显存: MB（若能取到）
         """
-        data: Dict[str, Optional[float]] = {
-            "cpu_temp": None,
-            "cpu_power": None,
-            "cpu_freq": None,
-            "cpu_load": None,
-
-            "gpu_temp": None,
-            "gpu_power": None,
-            "gpu_freq": None,
-            "gpu_load": None,
-            "gpu_vram_used": None,   # MB (如可用)
-            "gpu_vram_total": None,  # MB (如可用)
-
-            "disk_temp": None,
-            "disk_load": None,
-        }
-
-        for hw in self.comp.Hardware:
-            hw.Update()
-
-            # 有些硬件有子硬件（比如 CPU Package/核心、GPU 多个节点）
-            sub_hws = list(hw.SubHardware) if getattr(hw, "SubHardware", None) else []
-            for shw in sub_hws:
-                shw.Update()
-
-            def scan_one(h):
-                # CPU
-                if h.HardwareType == HardwareType.Cpu:
-                    for s in h.Sensors:
-                        if s.SensorType == SensorType.Temperature and (s.Name or "").lower().find("package") >= 0:
-                            data["cpu_temp"] = _sensor_value(s) or data["cpu_temp"]
-                        elif s.SensorType == SensorType.Power and (s.Name or "").lower().find("package") >= 0:
-                            data["cpu_power"] = _sensor_value(s) or data["cpu_power"]
-                        elif s.SensorType == SensorType.Clock and (s.Name or "").lower().find("core") >= 0:
-                            # 取一个代表性的 core clock（也可以改成平均）
-                            v = _sensor_value(s)
-                            if v is not None:
-                                data["cpu_freq"] = max(data["cpu_freq"] or 0.0, v)
-                        elif s.SensorType == SensorType.Load and (s.Name or "").lower().find("total") >= 0:
-                            data["cpu_load"] = _sensor_value(s) or data["cpu_load"]
-
-                # GPU
-                if h.HardwareType in (HardwareType.GpuNvidia, HardwareType.GpuAmd, HardwareType.GpuIntel):
-                    for s in h.Sensors:
-                        name = (s.Name or "").lower()
-                        if s.SensorType == SensorType.Temperature and ("gpu" in name or "core" in name):
-                            data["gpu_temp"] = _sensor_value(s) or data["gpu_temp"]
-                        elif s.SensorType == SensorType.Power and ("gpu" in name or "package" in name or "total" in name):
-                            data["gpu_power"] = _sensor_value(s) or data["gpu_power"]
-                        elif s.SensorType == SensorType.Clock and ("core" in name):
-                            v = _sensor_value(s)
-                            if v is not None:
-                                data["gpu_freq"] = max(data["gpu_freq"] or 0.0, v)
-                        elif s.SensorType == SensorType.Load and ("core" in name or "gpu" in name or "total" in name):
-                            data["gpu_load"] = _sensor_value(s) or data["gpu_load"]
-                        elif s.SensorType == SensorType.SmallData:
-                            # LHM 有时会把显存用量放 SmallData（取决于实现/驱动）
-                            if "memory used" in name or "vram used" in name:
-                                data["gpu_vram_used"] = _sensor_value(s) or data["gpu_vram_used"]
-                            if "memory total" in name or "vram total" in name:
-                                data["gpu_vram_total"] = _sensor_value(s) or data["gpu_vram_total"]
-
-                # Storage
-                if h.HardwareType == HardwareType.Storage:
-                    for s in h.Sensors:
-                        name = (s.Name or "").lower()
-                        if s.SensorType == SensorType.Temperature and ("temperature" in name or "drive" in name):
-                            data["disk_temp"] = _sensor_value(s) or data["disk_temp"]
-                        elif s.SensorType == SensorType.Load and ("used space" in name or "activity" in name or "total" in name):
-                            data["disk_load"] = _sensor_value(s) or data["disk_load"]
-
-            scan_one(hw)
-            for shw in sub_hws:
-                scan_one(shw)
-
-        return data
+        vals = self.values
+        vals[:] = self._blank
+
+        # Update 是阻塞的驱动/WMI 读取，按硬件类别错开；
+        # 没轮到的硬件，传感器里仍是上一次 Update 的值
+        self._tick += 1
+        for hw, period, bit in self._hw_list:
+            if need & bit and self._tick % period == 0:
+                hw.Update()
+
+        for sensor, idx, reducer, bit in self._bindings:
+            if not need & bit:
+                continue
+            v = _sensor_value(sensor)
+            if math.isnan(v):
+                continue
+            if reducer is _MAX:
+                prev = vals[idx]
+                vals[idx] = max(0.0 if math.isnan(prev) else prev, v)
+            elif v:
+                vals[idx] = v
+
+        return vals
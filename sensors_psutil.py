@@ -1,12 +1,85 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+import ctypes
+import math
+import sys
 import psutil
 import time
 
 
+# Windows 下直接用 GlobalMemoryStatusEx 填一个复用的结构体，
+# 省掉 psutil.virtual_memory() 每次构造 namedtuple
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    class MEMORYSTATUSEX(ctypes.Structure):
+        _fields_ = [
+            ("dwLength", wintypes.DWORD),
+            ("dwMemoryLoad", wintypes.DWORD),
+            ("ullTotalPhys", ctypes.c_ulonglong),
+            ("ullAvailPhys", ctypes.c_ulonglong),
+            ("ullTotalPageFile", ctypes.c_ulonglong),
+            ("ullAvailPageFile", ctypes.c_ulonglong),
+            ("ullTotalVirtual", ctypes.c_ulonglong),
+            ("ullAvailVirtual", ctypes.c_ulonglong),
+            ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+        ]
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _GlobalMemoryStatusEx = _kernel32.GlobalMemoryStatusEx
+    _GlobalMemoryStatusEx.argtypes = [ctypes.POINTER(MEMORYSTATUSEX)]
+    _GlobalMemoryStatusEx.restype = wintypes.BOOL
+else:
+    MEMORYSTATUSEX = None
+    _GlobalMemoryStatusEx = None
+
+_MB = 1024 * 1024
+
+READ_KEYS = (
+    "cpu_usage", "cpu_freq_psutil",
+    "ram_usage", "ram_used_gb", "ram_avail_gb",
+    "disk_read_mb_s", "disk_write_mb_s",
+    "net_up_mb_s", "net_down_mb_s",
+)
+
+CPU_FREQ_EVERY_N_READS = 10  # 频率变化慢，没必要每秒都问
+
+
+def _io_counters():
+    """
+    全盘 / 全网卡的合计计数器。
+    Windows 上这些计数器本来就是 64 位，不会回绕，关掉 nowrap 省掉 psutil
+    每次调用时在 Python 层做的回绕修正（逐设备 dict 拷贝 + 比较）
+    """
+    d = psutil.disk_io_counters(perdisk=False, nowrap=False)
+    n = psutil.net_io_counters(pernic=False, nowrap=False)
+    return d, n
+
+
+def _compute_rates(now_ns: int, last_ts_ns: int,
+                   dr: int, ldr: int, dw: int, ldw: int,
+                   ns: int, lns: int, nr: int, lnr: int) -> Tuple[float, float, float, float]:
+    """
+    计数器差 -> (磁盘读, 磁盘写, 上行, 下行) MB/s；先用整数算出 bytes/s。
+    网卡/磁盘计数器被重置时差值为负，按 0 处理
+    """
+    dt_ns = max(1, now_ns - last_ts_ns)
+    return (
+        max(0, dr - ldr) * 1_000_000_000 // dt_ns / _MB,
+        max(0, dw - ldw) * 1_000_000_000 // dt_ns / _MB,
+        max(0, ns - lns) * 1_000_000_000 // dt_ns / _MB,
+        max(0, nr - lnr) * 1_000_000_000 // dt_ns / _MB,
+    )
+
+
 @dataclass
 class RateState:
-    last_ts: float
+    # 手写 __slots__（dataclass(slots=True) 要 3.10+），属性访问走槽位而不是 __dict__
+    __slots__ = ("last_ts_ns", "last_disk_read", "last_disk_write", "last_net_sent", "last_net_recv")
+
+    last_ts_ns: int  # time.monotonic_ns()，不受系统校时影响
     last_disk_read: int
     last_disk_write: int
     last_net_sent: int
@@ -15,57 +88,99 @@ class RateState:
 
 class PsutilReader:
     def __init__(self):
-        d = psutil.disk_io_counters()
-        n = psutil.net_io_counters()
+        d, n = _io_counters()
         self.state = RateState(
-            last_ts=time.time(),
+            last_ts_ns=time.monotonic_ns(),
             last_disk_read=d.read_bytes if d else 0,
             last_disk_write=d.write_bytes if d else 0,
             last_net_sent=n.bytes_sent if n else 0,
             last_net_recv=n.bytes_recv if n else 0,
         )
 
-    def read(self) -> Dict[str, Optional[float]]:
-        now = time.time()
-        dt = max(1e-3, now - self.state.last_ts)
+        self._memstat = None
+        if MEMORYSTATUSEX is not None:
+            self._memstat = MEMORYSTATUSEX()
+            self._memstat.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
 
-        d = psutil.disk_io_counters()
-        n = psutil.net_io_counters()
+        self._freq_tick_counter = 0
+        self._cached_freq = math.nan
 
-        disk_read_bps = None
-        disk_write_bps = None
-        up_bps = None
-        down_bps = None
+        # read() 每次原地更新并返回同一个 dict；调用方需要跨次保留时自己拷贝。
+        # 值一律是 float，读不到的为 nan
+        self._result: Dict[str, float] = dict.fromkeys(READ_KEYS, math.nan)
 
-        if d:
-            disk_read_bps = (d.read_bytes - self.state.last_disk_read) / dt
-            disk_write_bps = (d.write_bytes - self.state.last_disk_write) / dt
-            self.state.last_disk_read = d.read_bytes
-            self.state.last_disk_write = d.write_bytes
+    def _read_memory(self) -> Optional[Tuple[float, int, int]]:
+        """(使用率 %, 已用字节, 可用字节)；与 psutil 在 Windows 上的算法一致"""
+        if self._memstat is not None:
+            if _GlobalMemoryStatusEx(ctypes.byref(self._memstat)):
+                total = self._memstat.ullTotalPhys
+                avail = self._memstat.ullAvailPhys
+                used = total - avail
+                return (round(used / total * 100, 1) if total else 0.0), used, avail
+        try:
+            vm = psutil.virtual_memory()
+        except Exception:
+            return None
+        return float(vm.percent), vm.used, vm.available
 
-        if n:
-            up_bps = (n.bytes_sent - self.state.last_net_sent) / dt
-            down_bps = (n.bytes_recv - self.state.last_net_recv) / dt
-            self.state.last_net_sent = n.bytes_sent
-            self.state.last_net_recv = n.bytes_recv
+    def _read_cpu_freq(self) -> float:
+        if self._freq_tick_counter % CPU_FREQ_EVERY_N_READS == 0:
+            try:
+                f = psutil.cpu_freq()
+                self._cached_freq = float(f.current) if f and f.current else math.nan
+            except Exception:
+                self._cached_freq = math.nan
+        self._freq_tick_counter += 1
+        return self._cached_freq
+
+    def read(self) -> Dict[str, float]:
+        now_ns = time.monotonic_ns()
+        d, n = _io_counters()
+        st = self.state
+
+        # 缺失的计数器先按“没变化”代入，算完再置 nan
+        dr = d.read_bytes if d else st.last_disk_read
+        dw = d.write_bytes if d else st.last_disk_write
+        ns = n.bytes_sent if n else st.last_net_sent
+        nr = n.bytes_recv if n else st.last_net_recv
+
+        disk_r, disk_w, up, down = _compute_rates(
+            now_ns, st.last_ts_ns,
+            dr, st.last_disk_read,
+            dw, st.last_disk_write,
+            ns, st.last_net_sent,
+            nr, st.last_net_recv,
+        )
+        if not d:
+            disk_r = disk_w = math.nan
+        if not n:
+            up = down = math.nan
 
-        self.state.last_ts = now
+        st.last_disk_read = dr
+        st.last_disk_write = dw
+        st.last_net_sent = ns
+        st.last_net_recv = nr
+        st.last_ts_ns = now_ns
 
-        cpu_percent = psutil.cpu_percent(interval=None)
-        cpu_freq = psutil.cpu_freq()
-        vm = psutil.virtual_memory()
+        # cpu/ram 兜底都在这里做完，调用方不必再自己去问 psutil
+        try:
+            cpu_percent = psutil.cpu_percent(interval=None)
+        except Exception:
+            cpu_percent = 0.0
+        cpu_freq = self._read_cpu_freq()
+        mem = self._read_memory()
 
-        return {
-            "cpu_usage": float(cpu_percent) if cpu_percent is not None else None,
-            "cpu_freq_psutil": float(cpu_freq.current) if cpu_freq and cpu_freq.current else None,
+        r = self._result
+        r["cpu_usage"] = float(cpu_percent) if cpu_percent is not None else 0.0
+        r["cpu_freq_psutil"] = cpu_freq
 
-            "ram_usage": float(vm.percent) if vm else None,
-            "ram_used_gb": float(vm.used) / (1024**3) if vm else None,
-            "ram_avail_gb": float(vm.available) / (1024**3) if vm else None,
+        r["ram_usage"] = mem[0] if mem else math.nan
+        r["ram_used_gb"] = mem[1] / (1024**3) if mem else math.nan
+        r["ram_avail_gb"] = mem[2] / (1024**3) if mem else math.nan
 
-            "disk_read_mb_s": float(disk_read_bps) / (1024**2) if disk_read_bps is not None else None,
-            "disk_write_mb_s": float(disk_write_bps) / (1024**2) if disk_write_bps is not None else None,
+        r["disk_read_mb_s"] = disk_r
+        r["disk_write_mb_s"] = disk_w
 
-            "net_up_mb_s": float(up_bps) / (1024**2) if up_bps is not None else None,
-            "net_down_mb_s": float(down_bps) / (1024**2) if down_bps is not None else None,
-        }
+        r["net_up_mb_s"] = up
+        r["net_down_mb_s"] = down
+        return r